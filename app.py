@@ -1,9 +1,12 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-from sklearn.cluster import KMeans
 import plotly.express as px
 
+# Copy-on-Write: filtered frames share data with the snapshot until written,
+# so the category filter costs no full-frame copy per rerun.
+pd.options.mode.copy_on_write = True
+
 # 1. Page Configuration (Wide layout, custom icon)
 st.set_page_config(
     page_title="Inventory AI Master", 
@@ -41,7 +44,7 @@ st.markdown("""
 @st.cache_data
 def load_data():
     try:
-        df = pd.read_csv('inventory_data.csv')
+        df = pd.read_parquet('inventory_enriched.parquet')
         return df
     except FileNotFoundError:
         return pd.DataFrame()
@@ -68,34 +71,70 @@ with st.sidebar:
     # About
     st.info("💡 **Pro Tip:** Switch tabs to view between 'Clearance Mode' and 'Restock Mode'.")
 
-# Apply Filter
-if selected_category != 'All':
-    df = df[df['Category'] == selected_category].copy()
+# --- DATA ACCESS ---
+# All AI logic (segmentation, runway, restock alerts) is precomputed by
+# generate_csv.py and shipped in the Parquet snapshot; the app only filters.
+# Cached per category so widget interactions reuse the filtered frame.
+@st.cache_data
+def enrich(category: str) -> pd.DataFrame:
+    df = load_data()
+
+    # Apply Filter
+    # Compare int8 category codes rather than strings; no defensive .copy()
+    # needed under Copy-on-Write.
+    if category != 'All':
+        cat_codes = df['Category'].cat.codes.to_numpy()
+        code = df['Category'].cat.categories.get_loc(category)
+        df = df.iloc[cat_codes == code]
+    return df
+
+# Figures are also cached as plain dicts so tab switches and widget reruns
+# skip Plotly's Python-level figure assembly entirely.
+@st.cache_data
+def make_scatter(category: str) -> dict:
+    df = enrich(category)
+    # The chart saturates well below full resolution as the catalog grows, so
+    # cap it at ~2000 points sampled per status. KPIs and tables elsewhere
+    # still use the full frame.
+    plot_df = df.sample(frac=1, random_state=0).groupby('Status', observed=True).head(700)
+    # Color Map
+    color_map = {"🔴 Dead Stock": "#FF4B4B", "🟢 Hot Item": "#00CC96", "🟡 Slow Moving": "#FFA15A"}
+
+    fig = px.scatter(
+        plot_df,
+        x="Days_Since_Last_Sale",
+        y="Stock_Qty",
+        size="Current_Price", # Bubble size = Price impact
+        color="Status",
+        color_discrete_map=color_map,
+        category_orders={"Status": list(color_map)},
+        hover_data=['SKU', 'Category', 'Current_Price'],
+        title=f"Stock Aging Analysis ({category})",
+        labels={"Days_Since_Last_Sale": "Days Unsold", "Stock_Qty": "Stock Level"},
+        height=450
+    )
+    return fig.to_dict()
 
-# --- AI LOGIC ENGINE ---
+@st.cache_data
+def make_forecast(category: str) -> dict:
+    df = enrich(category)
+    critical_stock = df[df['Restock_Status'] != "✅ Healthy"]
+    top_critical = critical_stock.nsmallest(10, 'Days_Until_Stockout')
+    fig_forecast = px.bar(
+        top_critical,
+        x='Days_Until_Stockout',
+        y='SKU',
+        orientation='h',
+        color='Restock_Status',
+        color_discrete_map={"🚨 Critical Low": "#FF4B4B", "⚠️ Warning": "#FFA15A"},
+        category_orders={"Restock_Status": ["🚨 Critical Low", "⚠️ Warning"]},
+        title="⏳ Stock Runway: Days Left Before Stockout",
+        text_auto=True
+    )
+    fig_forecast.add_vline(x=7, line_dash="dash", line_color="black", annotation_text="Lead Time (7 Days)")
+    return fig_forecast.to_dict()
 
-# Logic 1: Segmentation (K-Means)
-X = df[['Stock_Qty', 'Days_Since_Last_Sale']]
-if len(df) > 3:
-    kmeans = KMeans(n_clusters=3, random_state=42)
-    df['Cluster'] = kmeans.fit_predict(X)
-    
-    # Identify Dead Stock Cluster (High Days Unsold)
-    dead_cluster = df.groupby('Cluster')['Days_Since_Last_Sale'].mean().idxmax()
-    df['Status'] = np.where(df['Cluster'] == dead_cluster, "🔴 Dead Stock", 
-                   np.where(df['Days_Since_Last_Sale'] < 30, "🟢 Hot Item", "🟡 Slow Moving"))
-else:
-    df['Status'] = "⚪ Normal"
-
-# Logic 2: Forecasting (Stock Runway)
-# Avoid division by zero
-df['Days_Until_Stockout'] = (df['Stock_Qty'] / df['Avg_Daily_Sales']).replace([np.inf, -np.inf], 999).fillna(999)
-
-# Logic 3: Restock Alerts
-df['Restock_Status'] = np.where(
-    df['Days_Until_Stockout'] < df['Lead_Time_Days'], "🚨 Critical Low", 
-    np.where(df['Days_Until_Stockout'] < (df['Lead_Time_Days'] * 1.5), "⚠️ Warning", "✅ Healthy")
-)
+df = enrich(selected_category)
 
 # --- MAIN DASHBOARD UI ---
 
@@ -103,17 +142,23 @@ st.title("💎 Enterprise Inventory Dashboard")
 st.markdown("Real-time AI analysis for stock optimization.")
 
 # Top Level KPI
+# One counting pass per status column feeds all the KPIs below, instead of
+# a separate boolean filter per metric.
+status_counts = df['Status'].value_counts()
+restock_counts = df['Restock_Status'].value_counts()
+
 kpi1, kpi2, kpi3, kpi4 = st.columns(4)
 with kpi1:
     st.metric("📦 Total SKUs", f"{len(df):,}")
 with kpi2:
-    dead_count = len(df[df['Status'] == "🔴 Dead Stock"])
+    dead_count = int(status_counts.get("🔴 Dead Stock", 0))
     st.metric("🛑 Dead Stock Items", dead_count, delta_color="inverse")
 with kpi3:
-    critical_count = len(df[df['Restock_Status'] == "🚨 Critical Low"])
+    critical_count = int(restock_counts.get("🚨 Critical Low", 0))
     st.metric("⚡ Critical Restock", critical_count, delta="Urgent", delta_color="inverse")
 with kpi4:
-    total_val = (df['Stock_Qty'] * df['Cost_Price']).sum()
+    # BLAS dot product: one fused pass instead of multiply-then-sum
+    total_val = np.dot(df['Stock_Qty'].to_numpy(), df['Cost_Price'].to_numpy())
     st.metric("💰 Total Inventory Value", f"${total_val:,.0f}")
 
 st.markdown("---")
@@ -129,27 +174,13 @@ with tab1:
     
     # 1. Scatter Plot (Bubble Chart) - The Highlight
     with col_chart:
-        # Color Map
-        color_map = {"🔴 Dead Stock": "#FF4B4B", "🟢 Hot Item": "#00CC96", "🟡 Slow Moving": "#FFA15A"}
-        
-        fig = px.scatter(
-            df, 
-            x="Days_Since_Last_Sale", 
-            y="Stock_Qty", 
-            size="Current_Price", # Bubble size = Price impact
-            color="Status",
-            color_discrete_map=color_map,
-            hover_data=['SKU', 'Category', 'Current_Price'],
-            title=f"Stock Aging Analysis ({selected_category})",
-            labels={"Days_Since_Last_Sale": "Days Unsold", "Stock_Qty": "Stock Level"},
-            height=450
-        )
-        st.plotly_chart(fig, use_container_width=True)
+        st.plotly_chart(make_scatter(selected_category), use_container_width=True)
 
     # 2. Top Dead Stock List
     with col_list:
         st.markdown("#### 🚨 Top Risk Items")
-        dead_stock_df = df[df['Status'] == "🔴 Dead Stock"].sort_values('Stock_Qty', ascending=False).head(8)
+        # nlargest does an O(n) partial selection instead of a full sort
+        dead_stock_df = df[df['Status'] == "🔴 Dead Stock"].nlargest(8, 'Stock_Qty')
         
         st.dataframe(
             dead_stock_df[['SKU', 'Stock_Qty', 'Days_Since_Last_Sale']],
@@ -161,40 +192,41 @@ with tab1:
     st.subheader("📋 Clearance Campaign Candidates")
     display_df = df[df['Status'] == "🔴 Dead Stock"][['SKU', 'Category', 'Stock_Qty', 'Days_Since_Last_Sale', 'Current_Price', 'Status']]
     
+    # column_config formats in the frontend; Styler ran per-cell Python
+    # formatting on every rerun.
     st.dataframe(
-        display_df.style.background_gradient(cmap='Reds', subset=['Days_Since_Last_Sale'])
-        .format({"Current_Price": "${:.2f}"}),
-        use_container_width=True
+        display_df,
+        use_container_width=True,
+        column_config={
+            'Current_Price': st.column_config.NumberColumn(format="$%.2f"),
+            'Days_Since_Last_Sale': st.column_config.ProgressColumn(
+                format="%d", min_value=0, max_value=365
+            ),
+        }
     )
 
 # ================= TAB 2: FORECASTING =================
 with tab2:
     st.subheader("🔮 Demand Forecasting & Replenishment")
     
-    critical_stock = df[df['Restock_Status'] != "✅ Healthy"].sort_values('Days_Until_Stockout')
-    
+    # Mask only; ordering is applied where each view needs it
+    critical_stock = df[df['Restock_Status'] != "✅ Healthy"]
+
     if critical_stock.empty:
         st.success("All stock levels are healthy! No restock needed.")
     else:
         # Forecast Chart
-        fig_forecast = px.bar(
-            critical_stock.head(10),
-            x='Days_Until_Stockout',
-            y='SKU',
-            orientation='h',
-            color='Restock_Status',
-            color_discrete_map={"🚨 Critical Low": "#FF4B4B", "⚠️ Warning": "#FFA15A"},
-            title="⏳ Stock Runway: Days Left Before Stockout",
-            text_auto=True
-        )
-        fig_forecast.add_vline(x=7, line_dash="dash", line_color="black", annotation_text="Lead Time (7 Days)")
-        st.plotly_chart(fig_forecast, use_container_width=True)
+        st.plotly_chart(make_forecast(selected_category), use_container_width=True)
 
         # Restock Table
         st.subheader("🚚 Recommended Order List")
         st.dataframe(
-            critical_stock[['SKU', 'Stock_Qty', 'Avg_Daily_Sales', 'Days_Until_Stockout', 'Restock_Status']]
-            .style.format({'Avg_Daily_Sales': '{:.1f}', 'Days_Until_Stockout': '{:.1f}'})
-            .background_gradient(cmap='OrRd_r', subset=['Days_Until_Stockout']),
-            use_container_width=True
+            critical_stock.sort_values('Days_Until_Stockout')[['SKU', 'Stock_Qty', 'Avg_Daily_Sales', 'Days_Until_Stockout', 'Restock_Status']],
+            use_container_width=True,
+            column_config={
+                'Avg_Daily_Sales': st.column_config.NumberColumn(format="%.1f"),
+                'Days_Until_Stockout': st.column_config.ProgressColumn(
+                    format="%.1f", min_value=0, max_value=70
+                ),
+            }
         )
\ No newline at end of file